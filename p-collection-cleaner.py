@@ -6,22 +6,56 @@ This script connects to a Plex server and removes all collections that don't hav
 while keeping collections with labels intact.
 """
 
-import argparse
 import fnmatch
 import logging
 import os
+import re
 import sys
-import traceback
-from typing import List, Optional
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from types import SimpleNamespace
+from typing import Dict, FrozenSet, List, NamedTuple, Optional, Pattern, Tuple
 
 from plexapi.server import PlexServer
 from plexapi.library import Library
 from plexapi.collection import Collection
 from plexapi.exceptions import PlexApiException
 
+# Number of libraries analyzed in parallel
+ANALYSIS_WORKERS = 4
+
+# Number of concurrent collection deletes, kept low to avoid overloading the server
+DELETE_WORKERS = 3
+
+# Per-thread log buffer used while a library is analyzed off the main thread
+_log_buffer = threading.local()
+
+# Console handler installed by setup_logging, which replays the buffered records
+_console_handler: Optional[logging.Handler] = None
+
+
+class CollectionInfo(NamedTuple):
+    """The collection fields needed to apply label rules, read from the library listing."""
+    rating_key: str
+    title: str
+    child_count: Optional[int]
+    labels: List[str]
+
+
+class _ThreadBufferFilter(logging.Filter):
+    """Divert log records from analysis worker threads into their library's buffer."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        records = getattr(_log_buffer, 'records', None)
+        if records is None:
+            return True
+        records.append(record)
+        return False
+
 
 def setup_logging(debug: bool = False) -> None:
     """Setup logging configuration with enhanced formatting for Docker."""
+    global _console_handler
     level = logging.DEBUG if debug else logging.INFO
 
     # Enhanced format for better debugging
@@ -32,6 +66,8 @@ def setup_logging(debug: bool = False) -> None:
     # Console handler with custom formatter
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setFormatter(formatter)
+    console_handler.addFilter(_ThreadBufferFilter())
+    _console_handler = console_handler
 
     # Configure root logger
     root_logger = logging.getLogger()
@@ -55,43 +91,97 @@ def parse_label_list(label_string: str) -> List[str]:
     return [label.strip() for label in label_string.split(',') if label.strip()]
 
 
-def matches_label_pattern(label: str, patterns: List[str]) -> bool:
-    """Check if a label matches any of the given patterns (supports wildcards)."""
+def compile_label_patterns(patterns: List[str]) -> Optional[Pattern[str]]:
+    """Combine wildcard label patterns into a single case-insensitive regex (None if no patterns)."""
     if not patterns:
-        return False
+        return None
 
-    for pattern in patterns:
-        if fnmatch.fnmatch(label.lower(), pattern.lower()):
-            return True
-    return False
+    # Lowercase each pattern once, dropping duplicates that differ only by case
+    patterns_lc = dict.fromkeys(pattern.lower() for pattern in patterns)
+    return re.compile('|'.join(f'(?:{fnmatch.translate(pattern)})' for pattern in patterns_lc))
 
 
-def should_remove_collection(collection, delete_labels: List[str], delete_patterns: List[str]) -> tuple[bool, str]:
+def should_remove_collection(label_tags: List[str], delete_labels_lc: FrozenSet[str],
+                             patterns_re: Optional[Pattern[str]]) -> tuple[bool, str]:
     """
     Determine if a collection should be removed based on label rules.
 
+    label_tags are the collection's label names, delete_labels_lc is the set of exact
+    delete labels, already lowercased, and patterns_re is the combined regex built by
+    compile_label_patterns.
+
     Returns:
         tuple: (should_remove: bool, reason: str)
     """
-    labels = collection.labels
-    label_names = [label.tag for label in labels] if labels else []
-
     # Rule 1: Always remove collections without any labels
-    if not labels:
+    if not label_tags:
         return True, "NO LABELS"
 
-    # Rule 2: Remove collections with matching exact labels
-    for label_name in label_names:
-        if label_name.lower() in [dl.lower() for dl in delete_labels]:
-            return True, f"MATCHES DELETE LABEL: {label_name}"
+    # Without label-based rules configured, only Rule 1 can apply
+    if not delete_labels_lc and patterns_re is None:
+        return False, f"HAS LABELS: {label_tags}"
 
-    # Rule 3: Remove collections with labels matching patterns
-    for label_name in label_names:
-        if matches_label_pattern(label_name, delete_patterns):
-            return True, f"MATCHES DELETE PATTERN: {label_name}"
+    # Rules 2 and 3: Remove collections with exact or pattern-matching labels, stopping at the first hit.
+    # No Bloom pre-filter: the exact check is already an O(1) frozenset lookup, and a
+    # Bloom filter cannot represent glob patterns, so the regex would still have to run.
+    for tag in label_tags:
+        tag_lc = tag.lower()
+        if tag_lc in delete_labels_lc:
+            return True, f"MATCHES DELETE LABEL: {tag}"
+        if patterns_re is not None and patterns_re.match(tag_lc):
+            return True, f"MATCHES DELETE PATTERN: {tag}"
 
     # Keep collection
-    return False, f"HAS PROTECTED LABELS: {label_names}"
+    return False, f"HAS PROTECTED LABELS: {label_tags}"
+
+
+def _fast_list_collections(library: Library) -> List[CollectionInfo]:
+    """
+    List a library's collections straight from the XML response.
+
+    This skips building a PlexAPI Collection object per collection; one is only
+    fetched for entries listed without labels and for collections that get deleted.
+    """
+    data = library._server.query(f'/library/sections/{library.key}/collections?includeLabels=1')
+    if data is None:
+        return []
+
+    collections = []
+    for element in data.findall('Directory'):
+        child_count = element.get('childCount')
+        collections.append(CollectionInfo(
+            rating_key=element.get('ratingKey'),
+            title=element.get('title'),
+            child_count=int(child_count) if child_count else None,
+            labels=[label.get('tag') for label in element.findall('Label')],
+        ))
+    return collections
+
+
+def _fetch_label_tags(plex: PlexServer, rating_key: str) -> List[str]:
+    """Fetch a collection by its rating key and return its label names."""
+    collection = plex.fetchItem(int(rating_key), cls=Collection)
+    return [label.tag for label in collection.labels]
+
+
+def _delete_collection(plex: PlexServer, rating_key: str, delete_labels_lc: FrozenSet[str],
+                       patterns_re: Optional[Pattern[str]]) -> Tuple[bool, str]:
+    """
+    Fetch a collection by its rating key and delete it if the label rules still apply.
+
+    The listing is only a snapshot, so the rules are re-checked against the labels of
+    the fully loaded collection before anything is deleted.
+
+    Returns:
+        tuple: (removed: bool, reason: str)
+    """
+    collection = plex.fetchItem(int(rating_key), cls=Collection)
+    should_remove, reason = should_remove_collection(
+        [label.tag for label in collection.labels], delete_labels_lc, patterns_re
+    )
+    if should_remove:
+        collection.delete()
+    return should_remove, reason
 
 
 def connect_to_plex(server_url: str, token: str) -> PlexServer:
@@ -114,12 +204,13 @@ def connect_to_plex(server_url: str, token: str) -> PlexServer:
         logging.info(f"Server Platform: {plex.platform}")
         logging.info(f"Server Platform Version: {plex.platformVersion}")
 
-        # Test basic functionality
-        try:
-            account = plex.myPlexAccount()
-            logging.info(f"Authenticated as: {account.username if account else 'Unknown'}")
-        except Exception as e:
-            logging.warning(f"Could not get account info: {e}")
+        # Looking up the account is a round-trip to plex.tv, so only do it when debugging
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            try:
+                account = plex.myPlexAccount()
+                logging.info(f"Authenticated as: {account.username if account else 'Unknown'}")
+            except Exception as e:
+                logging.warning(f"Could not get account info: {e}")
 
         logging.info("Connection verification complete!")
         return plex
@@ -153,52 +244,66 @@ def connect_to_plex(server_url: str, token: str) -> PlexServer:
         logging.error("=" * 50)
         logging.error(f"Unexpected error: {e}")
         logging.error(f"Error Type: {type(e).__name__}")
-        logging.error(f"Full traceback:\n{traceback.format_exc()}")
+        logging.error("Full traceback:", exc_info=True)
         sys.exit(1)
 
 
-def get_collections_for_removal(library: Library, delete_labels: List[str], delete_patterns: List[str]) -> List[Collection]:
-    """Get all collections in a library that should be removed based on label rules."""
+def get_collections_for_removal(library: Library, delete_labels_lc: FrozenSet[str],
+                                patterns_re: Optional[Pattern[str]]) -> Tuple[List[CollectionInfo], int]:
+    """
+    Get all collections in a library that should be removed based on label rules.
+
+    Returns:
+        tuple: (collections_to_remove: list, total_collections: int)
+    """
     collections_to_remove = []
+    total_collections = 0
 
     logging.info(f"\n📚 Analyzing library: {library.title}")
     logging.info(f"Library type: {library.type}")
 
     try:
         logging.debug("Fetching collections from library...")
-        collections = library.collections()
+        collections = _fast_list_collections(library)
+        total_collections = len(collections)
         logging.info(f"✓ Found {len(collections)} total collections in library '{library.title}'")
 
         if not collections:
             logging.info("No collections found in this library")
-            return collections_to_remove
+            return collections_to_remove, total_collections
 
         logging.info("\n🔍 Analyzing each collection:")
         logging.info("-" * 40)
 
+        # Per-collection logging uses lazy %-formatting; these lines run once per collection
+        log_debug = logging.debug
+        log_info = logging.info
+
         for i, collection in enumerate(collections, 1):
             try:
-                logging.debug(f"[{i}/{len(collections)}] Processing: {collection.title}")
+                log_debug("[%d/%d] Processing: %s", i, total_collections, collection.title)
+
+                # Item count comes from the listing response, avoiding a children fetch per collection
+                item_count = collection.child_count if collection.child_count is not None else "Unknown"
 
-                # Get collection details
-                try:
-                    item_count = len(collection.items())
-                except Exception as e:
-                    logging.debug(f"Could not get item count for '{collection.title}': {e}")
-                    item_count = "Unknown"
+                # A listing entry without labels may just be partial, so confirm against the
+                # full collection before marking it (as PlexAPI's reload of empty labels did)
+                label_tags = collection.labels
+                if not label_tags:
+                    label_tags = _fetch_label_tags(library._server, collection.rating_key)
 
                 # Determine if collection should be removed
-                should_remove, reason = should_remove_collection(collection, delete_labels, delete_patterns)
+                should_remove, reason = should_remove_collection(label_tags, delete_labels_lc, patterns_re)
 
                 if should_remove:
                     collections_to_remove.append(collection)
-                    logging.info(f"❌ [{i}] '{collection.title}' ({item_count} items) - {reason} → MARKED FOR REMOVAL")
+                    log_info("❌ [%d] '%s' (%s items) - %s → MARKED FOR REMOVAL", i, collection.title, item_count, reason)
                 else:
-                    logging.info(f"✅ [{i}] '{collection.title}' ({item_count} items) - {reason} → KEEPING")
+                    log_info("✅ [%d] '%s' (%s items) - %s → KEEPING", i, collection.title, item_count, reason)
 
             except Exception as e:
-                logging.error(f"❗ Error checking collection '{collection.title}': {e}")
-                logging.debug(f"Full traceback: {traceback.format_exc()}")
+                logging.error("❗ Error checking collection '%s': %s", collection.title, e)
+                log_debug("Full traceback:", exc_info=True)
 
         logging.info("-" * 40)
         logging.info(f"📊 Summary for '{library.title}':")
@@ -208,9 +313,64 @@ def get_collections_for_removal(library: Library, delete_labels: List[str], dele
 
     except Exception as e:
         logging.error(f"❗ Error getting collections from library '{library.title}': {e}")
-        logging.error(f"Error details: {traceback.format_exc()}")
+        logging.error("Error details:", exc_info=True)
 
-    return collections_to_remove
+    return collections_to_remove, total_collections
+
+
+def _analyze_library(library: Library, delete_labels_lc: FrozenSet[str],
+                     patterns_re: Optional[Pattern[str]]) -> Tuple[List[CollectionInfo], int, List[logging.LogRecord]]:
+    """Run get_collections_for_removal in a worker thread, buffering its log output."""
+    _log_buffer.records = []
+    try:
+        collections_to_remove, total_collections = get_collections_for_removal(library, delete_labels_lc, patterns_re)
+        return collections_to_remove, total_collections, _log_buffer.records
+    finally:
+        _log_buffer.records = None
+
+
+def _flush_log_records(records: List[logging.LogRecord]) -> None:
+    """Emit log records buffered by a worker thread, in their original order."""
+    # Only the console handler buffers worker records; other handlers already received them
+    if _console_handler is None:
+        return
+    for record in records:
+        if record.levelno >= _console_handler.level:
+            _console_handler.handle(record)
+
+
+def _submit_deletions(executor: ThreadPoolExecutor, plex: PlexServer, library: Library,
+                      collections_to_remove: List[CollectionInfo], titles: List[str],
+                      delete_labels_lc: FrozenSet[str], patterns_re: Optional[Pattern[str]]) -> Dict[Future, str]:
+    """
+    Queue deletion of a library's collections, returning each future mapped to its collection title.
+
+    Outcomes are logged by _collect_deletions once each delete has finished.
+    """
+    logging.info(f"\n🗑️  Queued {len(collections_to_remove)} collections for removal from '{library.title}'")
+    futures = {}
+    for collection, title in zip(collections_to_remove, titles):
+        future = executor.submit(_delete_collection, plex, collection.rating_key, delete_labels_lc, patterns_re)
+        futures[future] = title
+    return futures
+
+
+def _collect_deletions(futures: Dict[Future, str]) -> int:
+    """Wait for queued deletions, logging each outcome, and return how many succeeded."""
+    removed = 0
+    for future in as_completed(futures):
+        title = futures[future]
+        try:
+            was_removed, reason = future.result()
+            if not was_removed:
+                logging.warning("⏭️  Skipped '%s' - %s on re-check", title, reason)
+                continue
+            removed += 1
+            logging.info("✓ Successfully removed: %s", title)
+        except Exception as e:
+            logging.error("❌ Failed to remove collection '%s': %s", title, e)
+            logging.debug("Delete error traceback:", exc_info=True)
+    return removed
 
 
 def cleanup_collections(plex: PlexServer, dry_run: bool = True, confirm: bool = True,
@@ -220,6 +380,8 @@ def cleanup_collections(plex: PlexServer, dry_run: bool = True, confirm: bool =
         delete_labels = []
     if delete_patterns is None:
         delete_patterns = []
+    delete_labels_lc = frozenset(label.lower() for label in delete_labels)
+    patterns_re = compile_label_patterns(delete_patterns)
     total_removed = 0
     total_collections = 0
     libraries_processed = 0
@@ -231,58 +393,91 @@ def cleanup_collections(plex: PlexServer, dry_run: bool = True, confirm: bool =
     try:
         logging.info("Fetching library information...")
         libraries = plex.library.sections()
-        logging.info(f"✓ Found {len(libraries)} libraries on server")
+        library_count = len(libraries)
+        logging.info(f"✓ Found {library_count} libraries on server")
 
         if not libraries:
             logging.warning("No libraries found on server!")
             return
 
-        logging.info("\n📋 Available libraries:")
-        for i, lib in enumerate(libraries, 1):
-            logging.info(f"  {i}. {lib.title} ({lib.type})")
-
-        for library in libraries:
-            libraries_processed += 1
-            logging.info(f"\n{'='*20} LIBRARY {libraries_processed}/{len(libraries)} {'='*20}")
-
-            collections_to_remove = get_collections_for_removal(library, delete_labels, delete_patterns)
-            total_collections += len(library.collections()) if hasattr(library, 'collections') else 0
-
-            if not collections_to_remove:
-                logging.info(f"✅ No collections to remove found in library '{library.title}' - skipping")
-                continue
-
-            logging.info(f"\n⚠️  Found {len(collections_to_remove)} collections to remove:")
-            for i, collection in enumerate(collections_to_remove, 1):
-                logging.info(f"   {i}. {collection.title}")
+        if logging.getLogger().isEnabledFor(logging.INFO):
+            logging.info("\n📋 Available libraries:")
+            for i, lib in enumerate(libraries, 1):
+                logging.info("  %d. %s (%s)", i, lib.title, lib.type)
+
+        # Without a confirmation prompt, execute mode starts deleting each library's
+        # collections as soon as it is analyzed, overlapping deletes with analysis
+        stream_deletes = not dry_run and not confirm
+        pending_deletes = []
+
+        removal_plan = []
+
+        with ThreadPoolExecutor(max_workers=DELETE_WORKERS) as delete_executor:
+            # Phase 1: Analysis is read-only and network bound, so libraries are fetched
+            # concurrently. Results are consumed in library order to keep the log readable.
+            with ThreadPoolExecutor(max_workers=ANALYSIS_WORKERS) as analysis_executor:
+                analyses = analysis_executor.map(
+                    lambda lib: _analyze_library(lib, delete_labels_lc, patterns_re), libraries
+                )
+                for library, (collections_to_remove, library_total, log_records) in zip(libraries, analyses):
+                    libraries_processed += 1
+                    logging.info(f"\n{'='*20} LIBRARY {libraries_processed}/{library_count} {'='*20}")
+                    _flush_log_records(log_records)
+                    total_collections += library_total
+
+                    if not collections_to_remove:
+                        logging.info(f"✅ No collections to remove found in library '{library.title}' - skipping")
+                        continue
+
+                    remove_count = len(collections_to_remove)
+                    titles = [collection.title for collection in collections_to_remove]
+
+                    logging.info(f"\n⚠️  Found {remove_count} collections to remove:")
+                    for i, title in enumerate(titles, 1):
+                        logging.info("   %d. %s", i, title)
+
+                    if stream_deletes:
+                        pending_deletes.append(
+                            _submit_deletions(delete_executor, plex, library, collections_to_remove, titles,
+                                              delete_labels_lc, patterns_re)
+                        )
+                    else:
+                        removal_plan.append((library, collections_to_remove, titles))
+
+            total_pending = sum(len(collections_to_remove) for _, collections_to_remove, _ in removal_plan)
+
+            # Phase 2: Summarize every library's removals and confirm once. Streamed
+            # deletes are already under way, so they never enter the plan.
+            if removal_plan:
+                logging.info(f"\n📋 Removal plan: {total_pending} collections across {len(removal_plan)} libraries")
+                for library, collections_to_remove, _ in removal_plan:
+                    logging.info(f"   {library.title}: {len(collections_to_remove)} collections")
 
             if dry_run:
-                logging.info(f"\n🔍 DRY RUN: Would remove {len(collections_to_remove)} collections from '{library.title}'")
-                total_removed += len(collections_to_remove)
-                continue
-
-            # In execute mode
-            if confirm:
-                logging.warning(f"\n⚠️  About to PERMANENTLY DELETE {len(collections_to_remove)} collections from '{library.title}'!")
+                if removal_plan:
+                    logging.info(f"\n🔍 DRY RUN: Would remove {total_pending} collections")
+                total_removed = total_pending
+                removal_plan = []
+            elif removal_plan and confirm:
+                logging.warning(f"\n⚠️  About to PERMANENTLY DELETE {total_pending} collections from {len(removal_plan)} libraries!")
                 response = input(f"Proceed with deletion? Type 'DELETE' to confirm: ")
                 if response != 'DELETE':
-                    logging.info(f"Skipping library '{library.title}' - user cancelled")
-                    continue
-
-            logging.info(f"\n🗑️  Removing collections from '{library.title}'...")
-            for i, collection in enumerate(collections_to_remove, 1):
-                try:
-                    logging.info(f"[{i}/{len(collections_to_remove)}] Removing: {collection.title}")
-                    collection.delete()
-                    total_removed += 1
-                    logging.info(f"✓ Successfully removed: {collection.title}")
-                except Exception as e:
-                    logging.error(f"❌ Failed to remove collection '{collection.title}': {e}")
-                    logging.debug(f"Delete error traceback: {traceback.format_exc()}")
+                    logging.info("Skipping deletion - user cancelled")
+                    removal_plan = []
+
+            # Phase 3: Execute the confirmed removals, a few deletes in flight at a time
+            if stream_deletes:
+                for futures in pending_deletes:
+                    total_removed += _collect_deletions(futures)
+            else:
+                for library, collections_to_remove, titles in removal_plan:
+                    futures = _submit_deletions(delete_executor, plex, library, collections_to_remove, titles,
+                                                delete_labels_lc, patterns_re)
+                    total_removed += _collect_deletions(futures)
 
     except Exception as e:
         logging.error(f"\n❌ Critical error during cleanup: {e}")
-        logging.error(f"Error details: {traceback.format_exc()}")
+        logging.error("Error details:", exc_info=True)
         sys.exit(1)
 
     # Final summary
@@ -325,12 +520,22 @@ def get_env_var(name: str, default: Optional[str] = None, required: bool = False
     return value
 
 
-def main():
-    """Main function with environment variable support."""
-    parser = argparse.ArgumentParser(
-        description="Remove Plex collections that don't have labels",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
+USAGE = "usage: p-collection-cleaner.py [-h] [--server-url SERVER_URL] [--token TOKEN] [--dry-run] [--execute] [--no-confirm] [--debug]"
+
+HELP_TEXT = USAGE + """
+
+Remove Plex collections that don't have labels
+
+options:
+  -h, --help            show this help message and exit
+  --server-url SERVER_URL
+                        Plex server URL (can also use PLEX_URL env var)
+  --token TOKEN         Plex authentication token (can also use PLEX_TOKEN env var)
+  --dry-run             Show what would be removed without actually removing
+  --execute             Actually remove collections (overrides --dry-run and PLEX_DRY_RUN)
+  --no-confirm          Don't ask for confirmation before removing collections
+  --debug               Enable debug logging
+
 Environment Variables:
   PLEX_URL          Plex server URL (e.g., http://localhost:32400)
   PLEX_TOKEN        Plex authentication token
@@ -342,41 +547,55 @@ Docker Example:
   docker run -e PLEX_URL=http://host.docker.internal:32400 -e PLEX_TOKEN=xyz123 p-collection-cleaner
 
 Both command line arguments and environment variables are supported.
-Command line arguments take precedence over environment variables.
-        """
-    )
+Command line arguments take precedence over environment variables."""
 
-    # Command line arguments (optional if env vars are provided)
-    parser.add_argument(
-        "--server-url",
-        help="Plex server URL (can also use PLEX_URL env var)"
-    )
-    parser.add_argument(
-        "--token",
-        help="Plex authentication token (can also use PLEX_TOKEN env var)"
-    )
-    parser.add_argument(
-        "--dry-run",
-        action="store_true",
-        help="Show what would be removed without actually removing"
-    )
-    parser.add_argument(
-        "--execute",
-        action="store_true",
-        help="Actually remove collections (overrides --dry-run and PLEX_DRY_RUN)"
-    )
-    parser.add_argument(
-        "--no-confirm",
-        action="store_true",
-        help="Don't ask for confirmation before removing collections"
-    )
-    parser.add_argument(
-        "--debug",
-        action="store_true",
-        help="Enable debug logging"
-    )
+# Command line options taking a value, mapped to their attribute names
+VALUE_OPTIONS = {'--server-url': 'server_url', '--token': 'token'}
+
+# Command line switches, mapped to their attribute names
+FLAG_OPTIONS = {'--dry-run': 'dry_run', '--execute': 'execute', '--no-confirm': 'no_confirm', '--debug': 'debug'}
+
+
+def parse_args(argv: List[str]) -> SimpleNamespace:
+    """
+    Parse command line arguments.
 
-    args = parser.parse_args()
+    A small hand-rolled scanner is used instead of argparse to keep startup cheap for
+    scheduled runs, which are usually configured through environment variables only.
+    Unlike argparse, option abbreviations (e.g. --exec) and the bare -- separator are
+    not accepted.
+    """
+    args = SimpleNamespace(**{name: None for name in VALUE_OPTIONS.values()},
+                           **{name: False for name in FLAG_OPTIONS.values()})
+
+    def fail(message: str) -> None:
+        print(USAGE, file=sys.stderr)
+        print(f"p-collection-cleaner.py: error: {message}", file=sys.stderr)
+        sys.exit(2)
+
+    remaining = iter(argv)
+    for arg in remaining:
+        option, has_value, value = arg.partition('=')
+        if arg in ('-h', '--help'):
+            print(HELP_TEXT)
+            sys.exit(0)
+        elif option in VALUE_OPTIONS:
+            if not has_value:
+                value = next(remaining, None)
+                if value is None or value.startswith('--'):
+                    fail(f"argument {option}: expected one argument")
+            setattr(args, VALUE_OPTIONS[option], value)
+        elif arg in FLAG_OPTIONS:
+            setattr(args, FLAG_OPTIONS[arg], True)
+        else:
+            fail(f"unrecognized arguments: {arg}")
+
+    return args
+
+
+def main():
+    """Main function with environment variable support."""
+    args = parse_args(sys.argv[1:])
 
     # Get configuration from args or environment variables
     server_url = args.server_url or get_env_var('PLEX_URL', required=True)